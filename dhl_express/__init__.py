@@ -1 +1,6 @@
 from .dhl import *
+
+try:
+    from .aio import *
+except ImportError:  # httpx is an optional dependency
+    pass
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Dict, List, Sequence
+
+import httpx
+import orjson
+
+from .dhl import DHLService
+
+
+__all__ = (
+    'AsyncDHLService',
+)
+
+
+class AsyncDHLService:
+    """
+    Async counterpart of DHLService built on httpx
+
+    Requests are multiplexed over a single HTTP/2 connection, so bulk
+    tracking or validation costs roughly one round-trip instead of one
+    per shipment. Requires the ``async`` extra (``pip install
+    dhl-express[async]``).
+    """
+
+    def __init__(self, api_key: str, api_secret: str, test_mode: bool = False, http2: bool = True):
+        client_kwargs = dict(
+            base_url=DHLService.dhl_test_url if test_mode else DHLService.dhl_base_url,
+            auth=httpx.BasicAuth(username=api_key, password=api_secret),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers={'Accept': 'application/json', 'Content-Type': 'application/json'}
+        )
+        if http2:
+            try:
+                self._client = httpx.AsyncClient(http2=True, **client_kwargs)
+                return
+            except ImportError:  # the h2 package is not installed
+                pass
+        self._client = httpx.AsyncClient(**client_kwargs)
+
+    async def __aenter__(self) -> 'AsyncDHLService':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def create_shipment(self, json: Dict) -> Dict:
+        """
+        Create a shipment
+        """
+        response = await self._client.post('shipments', content=orjson.dumps(json))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def get_shipment_proof(self, shipment_id: str) -> Dict:
+        """
+        Get the proofs of a shipment
+        """
+        response = await self._client.get(f'shipments/{shipment_id}/proof-of-delivery')
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def validate_address(self, params: Dict) -> Dict:
+        """
+        Validate an address
+        """
+        response = await self._client.get('address-validate', params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def get_shipment_status(self, shipment_id: str) -> Dict:
+        """
+        Check the status of a shipment
+        """
+        response = await self._client.get(f'shipments/{shipment_id}/tracking')
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def track_many(self, shipment_ids: Sequence[str]) -> List[Dict]:
+        """
+        Check the status of many shipments concurrently
+        """
+        return list(await asyncio.gather(
+            *(self.get_shipment_status(shipment_id) for shipment_id in shipment_ids)
+        ))
+
+    async def validate_many(self, params_list: Sequence[Dict]) -> List[Dict]:
+        """
+        Validate many addresses concurrently
+        """
+        return list(await asyncio.gather(
+            *(self.validate_address(params) for params in params_list)
+        ))